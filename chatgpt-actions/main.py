@@ -8,18 +8,41 @@ Author: Learning ChatGPT Actions
 Purpose: Understand how ChatGPT Custom GPTs integrate with external APIs
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
-import uuid
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
+from fastapi.responses import Response
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Tuple
+from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from cachetools import TTLCache
+import orjson
+import os
+import sys
+import time
 from datetime import datetime
 
 # ============================================================================
 # 1. INITIALIZE FASTAPI APP
 # ============================================================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the OpenAPI schema once, after all routes are registered"""
+    app.state.openapi_bytes = orjson.dumps(app.openapi())
+    yield
+
 app = FastAPI(
+    lifespan=lifespan,
+    # Schema and docs are served below from the cached schema bytes
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
     title="Decision Helper API",
     description="Help users make decisions between two options by structuring their thinking",
     version="1.0.0",
@@ -45,34 +68,52 @@ app.add_middleware(
 
 # This stores all decisions during the session
 # Key: decision_id, Value: decision data
-decisions: Dict[str, dict] = {}
+# Bounded with a TTL so abandoned decisions don't accumulate forever
+decisions: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
 
 # Track sessions to support multiple users
 # In production, you'd use a database
-sessions: Dict[str, str] = {}  # session_id -> current_decision_id
+sessions: TTLCache = TTLCache(maxsize=10_000, ttl=3600)  # session_id -> current_decision_id
+
+# Response status literals, interned once and shared by every response
+_STATUS_CREATED = sys.intern("created")
+_STATUS_PRIORITIES_SET = sys.intern("priorities_set")
+_STATUS_COMPLETED = sys.intern("completed")
+_STATUS_RESET = sys.intern("reset")
+_STATUS_NO_ACTIVE = sys.intern("no_active_decision")
+_STATUS_ACTIVE = sys.intern("active")
 
 # ============================================================================
 # 3. PYDANTIC MODELS (Request/Response schemas for OpenAPI)
 # ============================================================================
 
+# Requests come from clients and are validated by pydantic.
+# Responses are built from our own data, so they are plain slotted
+# dataclasses: no per-instance __dict__ and no validation on construction.
+
 class StartDecisionRequest(BaseModel):
     """Request to start a new decision"""
+    model_config = ConfigDict(frozen=True)
+
     title: str = Field(..., description="The decision question", example="Should I move to London or Berlin?")
     option_a: str = Field(..., description="First option to consider", example="London")
     option_b: str = Field(..., description="Second option to consider", example="Berlin")
     session_id: Optional[str] = Field(None, description="Optional session ID for tracking")
 
-class DecisionResponse(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class DecisionResponse:
     """Response when starting a new decision"""
     decision_id: str
     title: str
     option_a: str
     option_b: str
-    status: str = "created"
+    status: str = _STATUS_CREATED
     message: str
 
 class SetPrioritiesRequest(BaseModel):
     """Request to set priorities"""
+    model_config = ConfigDict(frozen=True)
+
     priorities: List[str] = Field(
         ..., 
         description="List of 1-3 priorities that matter most",
@@ -82,21 +123,24 @@ class SetPrioritiesRequest(BaseModel):
     decision_id: Optional[str] = Field(None, description="Decision ID. If not provided, uses current session decision")
     session_id: Optional[str] = Field(None, description="Session ID for tracking")
 
-class PrioritiesResponse(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class PrioritiesResponse:
     """Response when setting priorities"""
     decision_id: str
     priorities: List[str]
-    status: str = "priorities_set"
+    status: str = _STATUS_PRIORITIES_SET
     message: str
 
-class ComparisonCard(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ComparisonCard:
     """Structured comparison for one option"""
     option_name: str
     strengths: List[str]
-    considerations: List[str]
+    considerations: Tuple[str, ...]
     fit_score: str
 
-class SummaryResponse(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class SummaryResponse:
     """Final decision summary with structured UI data"""
     decision_id: str
     title: str
@@ -104,19 +148,23 @@ class SummaryResponse(BaseModel):
     option_b_card: ComparisonCard
     trade_offs: str
     what_this_means: str
-    status: str = "completed"
+    status: str = _STATUS_COMPLETED
 
 class SummaryRequest(BaseModel):
     """Request to generate summary"""
+    model_config = ConfigDict(frozen=True)
+
     decision_id: Optional[str] = Field(None, description="Decision ID to summarize")
     session_id: Optional[str] = Field(None, description="Session ID")
 
-class ResetResponse(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ResetResponse:
     """Response when resetting"""
     status: str
     message: str
 
-class DecisionStatusResponse(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class DecisionStatusResponse:
     """Current decision status"""
     status: str
     decision: Optional[dict] = None
@@ -130,26 +178,94 @@ def get_current_decision_id(session_id: Optional[str], decision_id: Optional[str
     """Get decision ID from session or explicit ID"""
     if decision_id:
         return decision_id
-    if session_id and session_id in sessions:
-        return sessions[session_id]
+    if session_id:
+        return sessions.get(session_id)
     return None
 
+def format_decision(decision: dict) -> dict:
+    """Copy of stored decision data with created_at as an ISO string"""
+    return {**decision, "created_at": datetime.fromtimestamp(decision["created_at"]).isoformat()}
+
+def json_response(data) -> Response:
+    """Serialize a response dataclass straight to JSON bytes (no asdict copy)"""
+    return Response(
+        orjson.dumps(data),
+        media_type="application/json"
+    )
+
+# Valid priority options (flexible - accept custom too)
+_VALID_PRIORITIES = frozenset(sys.intern(p) for p in (
+    "Cost", "Career growth", "Lifestyle",
+    "Work-life balance", "Stability", "Flexibility"
+))
+# Lowercase -> canonical name, for case-insensitive matching
+_PRIORITY_LOOKUP = {sys.intern(p.lower()): p for p in _VALID_PRIORITIES}
+
+# Static summary text, built once instead of on every /summarize call
+_STRENGTHS_TMPL = (
+    "Consider the benefits of %s",
+    "Evaluate how it aligns with your goals",
+    "Think about long-term implications"
+)
+_CONSIDERATIONS = (
+    "What are the potential drawbacks?",
+    "How does this fit your current situation?"
+)
+_FIT_SCORE_TMPL = "Alignment with your priorities: %s"
+_TRADE_OFFS_TMPL = "This decision involves weighing %s against %s. Based on your priorities (%s), consider how each option serves your goals."
+_WHAT_THIS_MEANS_TMPL = "Given what matters most to you, reflect on which option better aligns with your priorities of %s. Consider both short-term and long-term implications."
+
 # ============================================================================
 # 5. API ENDPOINTS (ChatGPT Actions)
 # ============================================================================
 
+# Health check payload never changes, so serialize it once
+_ROOT_BODY = orjson.dumps({
+    "status": "online",
+    "service": "Decision Helper API",
+    "version": "1.0.0",
+    "docs": "/docs"
+})
+
 @app.get("/")
-def root():
+async def root():
     """Health check endpoint"""
-    return {
-        "status": "online",
-        "service": "Decision Helper API",
-        "version": "1.0.0",
-        "docs": "/docs"
-    }
+    return Response(_ROOT_BODY, media_type="application/json")
+
+@app.get("/openapi.json", include_in_schema=False)
+async def openapi():
+    """OpenAPI schema, pre-serialized at startup"""
+    body = getattr(app.state, "openapi_bytes", None)
+    if body is None:
+        # Lifespan didn't run (e.g. --lifespan off), so build it now
+        body = app.state.openapi_bytes = orjson.dumps(app.openapi())
+    return Response(body, media_type="application/json")
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_docs(request: Request):
+    """Interactive API docs"""
+    root_path = request.scope.get("root_path", "").rstrip("/")
+    return get_swagger_ui_html(
+        openapi_url=root_path + "/openapi.json",
+        title=f"{app.title} - Swagger UI",
+        oauth2_redirect_url=root_path + "/docs/oauth2-redirect",
+        init_oauth=app.swagger_ui_init_oauth,
+        swagger_ui_parameters=app.swagger_ui_parameters
+    )
+
+@app.get("/docs/oauth2-redirect", include_in_schema=False)
+async def swagger_oauth2_redirect():
+    """OAuth2 redirect page for the Swagger UI"""
+    return get_swagger_ui_oauth2_redirect_html()
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc_docs(request: Request):
+    """ReDoc API docs"""
+    root_path = request.scope.get("root_path", "").rstrip("/")
+    return get_redoc_html(openapi_url=root_path + "/openapi.json", title=f"{app.title} - ReDoc")
 
-@app.post("/start-decision", response_model=DecisionResponse)
-def start_decision(request: StartDecisionRequest):
+@app.post("/start-decision", responses={200: {"model": DecisionResponse}})
+async def start_decision(request: StartDecisionRequest):
     """
     Start a new decision comparison between two options.
     
@@ -162,8 +278,8 @@ def start_decision(request: StartDecisionRequest):
     - "Which laptop should I buy: MacBook or ThinkPad?"
     """
     # Generate unique IDs
-    decision_id = str(uuid.uuid4())[:8]
-    session_id = request.session_id or str(uuid.uuid4())[:8]
+    decision_id: str = os.urandom(4).hex()
+    session_id: str = request.session_id or os.urandom(4).hex()
     
     # Store decision data
     decisions[decision_id] = {
@@ -171,23 +287,25 @@ def start_decision(request: StartDecisionRequest):
         "option_a": request.option_a,
         "option_b": request.option_b,
         "priorities": [],
-        "created_at": datetime.now().isoformat(),
+        "created_at": time.time(),  # Formatted on read
         "session_id": session_id
     }
     
     # Track in session
     sessions[session_id] = decision_id
     
-    return DecisionResponse(
+    response = DecisionResponse(
         decision_id=decision_id,
         title=request.title,
         option_a=request.option_a,
         option_b=request.option_b,
         message=f"Decision '{request.title}' created! Next, tell me what matters most to you (priorities)."
     )
+    
+    return json_response(response)
 
-@app.post("/set-priorities", response_model=PrioritiesResponse)
-def set_priorities(request: SetPrioritiesRequest):
+@app.post("/set-priorities", responses={200: {"model": PrioritiesResponse}})
+async def set_priorities(request: SetPrioritiesRequest):
     """
     Set what matters most for this decision (max 3 priorities).
     
@@ -206,9 +324,12 @@ def set_priorities(request: SetPrioritiesRequest):
     - "My priorities are career growth and work-life balance"
     """
     # Get decision ID
-    target_id = get_current_decision_id(request.session_id, request.decision_id)
+    target_id: Optional[str] = get_current_decision_id(request.session_id, request.decision_id)
+    
+    # Read once: a TTL entry can expire between a membership check and an index
+    decision: Optional[dict] = decisions.get(target_id) if target_id else None
     
-    if not target_id or target_id not in decisions:
+    if target_id is None or decision is None:
         raise HTTPException(
             status_code=404,
             detail="No active decision found. Please start a decision first using /start-decision"
@@ -221,30 +342,26 @@ def set_priorities(request: SetPrioritiesRequest):
             detail="Please select maximum 3 priorities"
         )
     
-    # Valid priority options (flexible - accept custom too)
-    valid_priorities = {
-        "Cost", "Career growth", "Lifestyle", 
-        "Work-life balance", "Stability", "Flexibility"
-    }
-    
     # Normalize priorities
-    normalized = []
+    normalized: List[str] = []
     for p in request.priorities:
         # Case-insensitive matching
-        matched = next((v for v in valid_priorities if v.lower() == p.lower()), None)
+        matched = _PRIORITY_LOOKUP.get(p.lower())
         normalized.append(matched if matched else p.title())
     
     # Update decision
-    decisions[target_id]["priorities"] = normalized
+    decision["priorities"] = normalized
     
-    return PrioritiesResponse(
+    response = PrioritiesResponse(
         decision_id=target_id,
         priorities=normalized,
         message=f"Got it! Your priorities are: {', '.join(normalized)}. Ready to generate comparison!"
     )
+    
+    return json_response(response)
 
-@app.post("/summarize", response_model=SummaryResponse)
-def summarize_decision(request: SummaryRequest):
+@app.post("/summarize", responses={200: {"model": SummaryResponse}})
+async def summarize_decision(request: SummaryRequest):
     """
     Generate a structured comparison summary with trade-off analysis.
     
@@ -257,60 +374,52 @@ def summarize_decision(request: SummaryRequest):
     - Personalized conclusion
     """
     # Get decision ID
-    target_id = get_current_decision_id(request.session_id, request.decision_id)
+    target_id: Optional[str] = get_current_decision_id(request.session_id, request.decision_id)
+    
+    # Read once: a TTL entry can expire between a membership check and an index
+    decision: Optional[dict] = decisions.get(target_id) if target_id else None
     
-    if not target_id or target_id not in decisions:
+    if target_id is None or decision is None:
         raise HTTPException(
             status_code=404,
             detail="No active decision found."
         )
     
-    decision = decisions[target_id]
-    
     # Extract data
-    title = decision["title"]
-    option_a = decision["option_a"]
-    option_b = decision["option_b"]
-    priorities = decision.get("priorities", [])
+    title: str = decision["title"]
+    option_a: str = decision["option_a"]
+    option_b: str = decision["option_b"]
+    priorities: List[str] = decision.get("priorities", [])
+    
+    # Join priorities once for all summary text
+    priority_text: str = ', '.join(priorities) if priorities else 'general factors'
+    top_priorities: str = ', '.join(priorities[:2]) if priorities else 'general evaluation'
     
     # Build comparison cards
     # Note: These are placeholder structures
     # In a real app, you might use AI or data to populate these
+    fit_score: str = _FIT_SCORE_TMPL % top_priorities
+    
     option_a_card = ComparisonCard(
         option_name=option_a,
-        strengths=[
-            f"Consider the benefits of {option_a}",
-            "Evaluate how it aligns with your goals",
-            "Think about long-term implications"
-        ],
-        considerations=[
-            "What are the potential drawbacks?",
-            "How does this fit your current situation?"
-        ],
-        fit_score=f"Alignment with your priorities: {', '.join(priorities[:2]) if priorities else 'general evaluation'}"
+        strengths=[_STRENGTHS_TMPL[0] % option_a, _STRENGTHS_TMPL[1], _STRENGTHS_TMPL[2]],
+        considerations=_CONSIDERATIONS,
+        fit_score=fit_score
     )
     
     option_b_card = ComparisonCard(
         option_name=option_b,
-        strengths=[
-            f"Consider the benefits of {option_b}",
-            "Evaluate how it aligns with your goals",
-            "Think about long-term implications"
-        ],
-        considerations=[
-            "What are the potential drawbacks?",
-            "How does this fit your current situation?"
-        ],
-        fit_score=f"Alignment with your priorities: {', '.join(priorities[:2]) if priorities else 'general evaluation'}"
+        strengths=[_STRENGTHS_TMPL[0] % option_b, _STRENGTHS_TMPL[1], _STRENGTHS_TMPL[2]],
+        considerations=_CONSIDERATIONS,
+        fit_score=fit_score
     )
     
     # Generate trade-off analysis
-    priority_text = ', '.join(priorities) if priorities else 'general factors'
-    trade_offs = f"This decision involves weighing {option_a} against {option_b}. Based on your priorities ({priority_text}), consider how each option serves your goals."
+    trade_offs: str = _TRADE_OFFS_TMPL % (option_a, option_b, priority_text)
     
-    what_this_means = f"Given what matters most to you, reflect on which option better aligns with your priorities of {priority_text}. Consider both short-term and long-term implications."
+    what_this_means: str = _WHAT_THIS_MEANS_TMPL % priority_text
     
-    return SummaryResponse(
+    summary = SummaryResponse(
         decision_id=target_id,
         title=title,
         option_a_card=option_a_card,
@@ -318,42 +427,51 @@ def summarize_decision(request: SummaryRequest):
         trade_offs=trade_offs,
         what_this_means=what_this_means
     )
+    
+    # Serialize directly to skip response_model re-validation
+    return json_response(summary)
 
-@app.post("/reset", response_model=ResetResponse)
-def reset_decision(session_id: Optional[str] = None):
+@app.post("/reset", responses={200: {"model": ResetResponse}})
+async def reset_decision(session_id: Optional[str] = None):
     """
     Clear the current decision and start fresh.
     
     Use this when the user wants to analyze a completely new decision.
     """
-    if session_id and session_id in sessions:
-        del sessions[session_id]
+    if session_id:
+        sessions.pop(session_id, None)
     
-    return ResetResponse(
-        status="reset",
+    response = ResetResponse(
+        status=_STATUS_RESET,
         message="Ready for a new decision! What would you like to decide?"
     )
+    
+    return json_response(response)
 
-@app.get("/status", response_model=DecisionStatusResponse)
-def get_decision_status(session_id: Optional[str] = None, decision_id: Optional[str] = None):
+@app.get("/status", responses={200: {"model": DecisionStatusResponse}})
+async def get_decision_status(session_id: Optional[str] = None, decision_id: Optional[str] = None):
     """
     Retrieve the current decision details.
     
     Useful for checking what's been captured so far.
     """
-    target_id = get_current_decision_id(session_id, decision_id)
+    target_id: Optional[str] = get_current_decision_id(session_id, decision_id)
+    decision: Optional[dict] = decisions.get(target_id) if target_id else None
     
-    if not target_id or target_id not in decisions:
-        return DecisionStatusResponse(
-            status="no_active_decision",
+    if decision is None:
+        response = DecisionStatusResponse(
+            status=_STATUS_NO_ACTIVE,
+            decision=None,
             message="No decision in progress"
         )
+    else:
+        response = DecisionStatusResponse(
+            status=_STATUS_ACTIVE,
+            decision=format_decision(decision),
+            message="Decision found"
+        )
     
-    return DecisionStatusResponse(
-        status="active",
-        decision=decisions[target_id],
-        message="Decision found"
-    )
+    return json_response(response)
 
 # ============================================================================
 # 6. RUN SERVER
@@ -372,9 +490,17 @@ if __name__ == "__main__":
     ╚══════════════════════════════════════════════════════════╝
     """)
     
+    # Set DEV=1 to auto-reload on code changes (single process)
+    dev = os.getenv("DEV") == "1"
+    
+    # Decisions live in process memory, so extra workers (WEB_CONCURRENCY)
+    # only make sense with sticky sessions or a shared store
+    workers = 1 if dev else int(os.getenv("WEB_CONCURRENCY", "1"))
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True  # Auto-reload on code changes
+        workers=workers,
+        reload=dev
     )
\ No newline at end of file
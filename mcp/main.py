@@ -12,8 +12,12 @@ Purpose: Understand ChatGPT app mechanics
 
 from fastmcp import FastMCP
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
-import uuid
+from typing import List, Optional
+from cachetools import TTLCache
+import os
+import sys
+import time
+import threading
 from datetime import datetime
 
 # ============================================================================
@@ -30,11 +34,34 @@ mcp = FastMCP(
 
 # This stores all decisions during the session
 # Key: decision_id, Value: decision data
-decisions: Dict[str, dict] = {}
+# Bounded with a TTL so abandoned decisions don't accumulate forever
+decisions: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+
+# TTLCache isn't thread-safe (even get() updates its internals), and
+# FastMCP runs sync tools on worker threads, so every access takes this lock
+_store_lock = threading.Lock()
+
+
+def _get_decision(decision_id: Optional[str]) -> Optional[dict]:
+    """Look up a stored decision under the store lock"""
+    if not decision_id:
+        return None
+    with _store_lock:
+        return decisions.get(decision_id)
+
 
 # Track the current active decision (for conversational flow)
+# Shared across tool calls on purpose; only start/reset write it
 current_decision_id: Optional[str] = None
 
+# Response status literals, interned once and shared by every response
+_STATUS_CREATED = sys.intern("created")
+_STATUS_PRIORITIES_SET = sys.intern("priorities_set")
+_STATUS_COMPLETED = sys.intern("completed")
+_STATUS_RESET = sys.intern("reset")
+_STATUS_NO_ACTIVE = sys.intern("no_active_decision")
+_STATUS_ACTIVE = sys.intern("active")
+
 # ============================================================================
 # 3. PYDANTIC MODELS (Type-safe data structures)
 # ============================================================================
@@ -45,7 +72,7 @@ class DecisionResponse(BaseModel):
     title: str
     option_a: str
     option_b: str
-    status: str = "created"
+    status: str = _STATUS_CREATED
     message: str
 
 
@@ -53,7 +80,7 @@ class PrioritiesResponse(BaseModel):
     """Response when setting priorities"""
     decision_id: str
     priorities: List[str]
-    status: str = "priorities_set"
+    status: str = _STATUS_PRIORITIES_SET
     message: str
 
 
@@ -73,7 +100,21 @@ class SummaryResponse(BaseModel):
     option_b_card: ComparisonCard
     trade_offs: str
     what_this_means: str
-    status: str = "completed"
+    status: str = _STATUS_COMPLETED
+
+
+def format_decision(decision: dict) -> dict:
+    """Copy of stored decision data with created_at as an ISO string"""
+    return {**decision, "created_at": datetime.fromtimestamp(decision["created_at"]).isoformat()}
+
+
+# Valid priority options
+_VALID_PRIORITIES = frozenset(sys.intern(p) for p in (
+    "Cost", "Career growth", "Lifestyle",
+    "Work-life balance", "Stability", "Flexibility"
+))
+# Lowercase -> canonical name, for case-insensitive matching
+_PRIORITY_LOOKUP = {sys.intern(p.lower()): p for p in _VALID_PRIORITIES}
 
 
 # ============================================================================
@@ -111,16 +152,17 @@ def start_decision(
     global current_decision_id
     
     # Generate unique ID for this decision
-    decision_id = str(uuid.uuid4())[:8]  # Short ID for readability
+    decision_id = os.urandom(4).hex()  # Short ID for readability
     
     # Store decision data
-    decisions[decision_id] = {
-        "title": title,
-        "option_a": option_a,
-        "option_b": option_b,
-        "priorities": [],
-        "created_at": datetime.now().isoformat()
-    }
+    with _store_lock:
+        decisions[decision_id] = {
+            "title": title,
+            "option_a": option_a,
+            "option_b": option_b,
+            "priorities": [],
+            "created_at": time.time()  # Formatted on read
+        }
     
     # Set as current active decision
     current_decision_id = decision_id
@@ -165,29 +207,24 @@ def set_priorities(
         User: "I care most about cost and lifestyle"
         Call: set_priorities(priorities=["Cost", "Lifestyle"])
     """
-    global current_decision_id
-    
     # Use provided ID or fall back to current decision
     target_id = decision_id or current_decision_id
     
-    if not target_id or target_id not in decisions:
+    # Read once: a TTL entry can expire between a membership check and an index
+    decision = _get_decision(target_id)
+    
+    if decision is None:
         raise ValueError("No active decision found. Please start a decision first.")
     
     # Validate max 3 priorities
     if len(priorities) > 3:
         raise ValueError("Please select maximum 3 priorities")
     
-    # Valid priority options
-    valid_priorities = {
-        "Cost", "Career growth", "Lifestyle", 
-        "Work-life balance", "Stability", "Flexibility"
-    }
-    
     # Normalize and validate
     normalized = []
     for p in priorities:
         # Case-insensitive matching
-        matched = next((v for v in valid_priorities if v.lower() == p.lower()), None)
+        matched = _PRIORITY_LOOKUP.get(p.lower())
         if matched:
             normalized.append(matched)
         else:
@@ -195,7 +232,7 @@ def set_priorities(
             normalized.append(p)
     
     # Update decision
-    decisions[target_id]["priorities"] = normalized
+    decision["priorities"] = normalized
     
     return PrioritiesResponse(
         decision_id=target_id,
@@ -230,15 +267,14 @@ def summarize_decision(
     Example:
         After user has set priorities, call this to generate final summary.
     """
-    global current_decision_id
-    
     # Use provided ID or fall back to current decision
     target_id = decision_id or current_decision_id
     
-    if not target_id or target_id not in decisions:
-        raise ValueError("No active decision found.")
+    # Read once: a TTL entry can expire between a membership check and an index
+    decision = _get_decision(target_id)
     
-    decision = decisions[target_id]
+    if decision is None:
+        raise ValueError("No active decision found.")
     
     # Extract data
     title = decision["title"]
@@ -318,7 +354,7 @@ def reset_decision() -> dict:
     current_decision_id = None
     
     return {
-        "status": "reset",
+        "status": _STATUS_RESET,
         "message": "Ready for a new decision! What would you like to decide?"
     }
 
@@ -337,15 +373,19 @@ def get_current_decision() -> dict:
     Returns:
         Current decision data or empty state
     """
-    if not current_decision_id or current_decision_id not in decisions:
+    # Read once so a concurrent reset can't change it mid-check
+    target_id = current_decision_id
+    decision = _get_decision(target_id)
+    
+    if decision is None:
         return {
-            "status": "no_active_decision",
+            "status": _STATUS_NO_ACTIVE,
             "message": "No decision in progress"
         }
     
     return {
-        "status": "active",
-        "decision": decisions[current_decision_id]
+        "status": _STATUS_ACTIVE,
+        "decision": format_decision(decision)
     }
 
 